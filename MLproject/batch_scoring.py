@@ -0,0 +1,148 @@
+"""
+Script batch scoring lokal multi-core untuk DataFrame data mentah berukuran besar
+Baris dibagi menjadi chunk, input dan output diletakkan di shared memory,
+lalu preprocessing + predict dikerjakan process pool yang masing-masing memuat model sekali
+"""
+
+import sys
+import numpy as np
+import pandas as pd
+import mlflow
+from concurrent.futures import ProcessPoolExecutor
+
+from preprocessAPI import data_preprocessing, LABEL_MAPPING
+from shared_array import share_array, empty_shared_array, attach_array, release
+
+CATEGORICAL_COLUMNS = ["Credit_Mix", "Payment_of_Min_Amount", "Payment_Behaviour"]
+NUMERIC_COLUMNS = [
+    "Age", "Num_Bank_Accounts", "Num_Credit_Card",
+    "Interest_Rate", "Num_of_Loan", "Delay_from_due_date",
+    "Num_of_Delayed_Payment", "Changed_Credit_Limit",
+    "Num_Credit_Inquiries", "Outstanding_Debt", "Monthly_Inhand_Salary",
+    "Monthly_Balance", "Amount_invested_monthly",
+    "Total_EMI_per_month", "Credit_History_Age"
+]
+
+TRACKING_URI = "http://127.0.0.1:5000/"
+
+# State per worker: model yang sudah dimuat dan view ke shared memory
+_worker = {}
+
+
+def _init_worker(model_uri, specs, stats):
+    """
+    Initializer worker: muat model sekali dan attach ke array input/output
+
+    Args:
+        model_uri (str): URI model MLflow
+        specs (dict): Spec shared memory untuk 'numeric', 'categorical', dan 'output'
+        stats (dict): Statistik preprocessing (opsional, lihat fit_preprocessing.py)
+    """
+    # Set eksplisit agar tetap benar dengan start method spawn (tanpa mewarisi state parent)
+    mlflow.set_tracking_uri(TRACKING_URI)
+    _worker["model"] = mlflow.pyfunc.load_model(model_uri)
+    _worker["stats"] = stats
+    for key, spec in specs.items():
+        _worker[key] = attach_array(spec)
+
+
+def _score_chunk(start, stop):
+    """
+    Preprocessing dan prediksi untuk baris [start, stop), hasil ditulis langsung ke output
+
+    Args:
+        start (int): Indeks baris awal
+        stop (int): Indeks baris akhir (eksklusif)
+
+    Returns:
+        tuple: (start, stop) sebagai penanda chunk selesai
+    """
+    numeric = _worker["numeric"][1][start:stop]
+    categorical = _worker["categorical"][1][start:stop]
+    output = _worker["output"][1]
+
+    chunk = pd.concat([
+        pd.DataFrame(categorical, columns=CATEGORICAL_COLUMNS),
+        pd.DataFrame(numeric, columns=NUMERIC_COLUMNS),
+    ], axis=1)
+
+    processed = data_preprocessing(chunk, stats=_worker["stats"])
+    output[start:stop] = np.asarray(_worker["model"].predict(processed))
+    return start, stop
+
+
+def score_batch(data, model_uri, n_workers=4, chunk_size=10_000, stats=None):
+    """
+    Melakukan scoring paralel untuk DataFrame data mentah
+
+    Args:
+        data (Pandas DataFrame): Data mentah dengan kolom CATEGORICAL_COLUMNS + NUMERIC_COLUMNS
+        model_uri (str): URI model MLflow, misalnya "models:/credit-scoring/1"
+        n_workers (int): Jumlah proses worker
+        chunk_size (int): Jumlah baris per chunk
+        stats (dict, optional): Statistik preprocessing hasil fit_preprocessing.py
+
+    Returns:
+        numpy.ndarray: Kode prediksi per baris, urutannya sama dengan input
+    """
+    n_rows = len(data)
+
+    # String kategorikal disimpan sebagai array unicode lebar tetap agar bisa di shared memory
+    categorical = data[CATEGORICAL_COLUMNS].astype(str).to_numpy(dtype=np.str_)
+    numeric = data[NUMERIC_COLUMNS].to_numpy(dtype=np.float64)
+
+    numeric_shm, numeric_spec = share_array(numeric)
+    categorical_shm, categorical_spec = share_array(categorical)
+    output_shm, output_spec, output = empty_shared_array((n_rows,), np.int64)
+    specs = {"numeric": numeric_spec, "categorical": categorical_spec, "output": output_spec}
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,
+            initargs=(model_uri, specs, stats),
+        ) as executor:
+            futures = [
+                executor.submit(_score_chunk, start, min(start + chunk_size, n_rows))
+                for start in range(0, n_rows, chunk_size)
+            ]
+            for future in futures:
+                future.result()
+
+        return output.copy()
+    finally:
+        del output
+        release(numeric_shm, categorical_shm, output_shm)
+
+
+def decode_labels(codes):
+    """
+    Mengubah kode prediksi menjadi label (Good, Poor, Standard)
+
+    Args:
+        codes (numpy.ndarray): Kode prediksi
+
+    Returns:
+        numpy.ndarray: Label prediksi
+    """
+    return np.array([LABEL_MAPPING.get(code, f"Unknown({code})") for code in codes.tolist()])
+
+
+if __name__ == "__main__":
+    # Contoh: python batch_scoring.py portfolio.csv hasil_scoring.csv "models:/credit-scoring/1" 8
+    input_path = sys.argv[1]
+    output_path = sys.argv[2] if len(sys.argv) > 2 else "hasil_scoring.csv"
+    model_uri = sys.argv[3] if len(sys.argv) > 3 else "models:/credit-scoring/1"
+    n_workers = int(sys.argv[4]) if len(sys.argv) > 4 else 4
+
+    mlflow.set_tracking_uri(TRACKING_URI)
+
+    raw = pd.read_csv(input_path)
+    print(f"[SCORING] {len(raw)} baris dengan {n_workers} worker...")
+
+    codes = score_batch(raw, model_uri, n_workers=n_workers)
+    raw["Prediction"] = decode_labels(codes)
+    raw.to_csv(output_path, index=False)
+
+    print("✓ Scoring selesai!")
+    print(f"  Output: {output_path}")
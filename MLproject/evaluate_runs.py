@@ -0,0 +1,285 @@
+"""
+Script evaluasi beberapa run MLflow sekaligus terhadap held-out set (test_pca.csv)
+Data test dimuat sekali ke shared memory, akurasi semua model dihitung paralel
+dengan jumlah worker dibatasi memori yang tersedia, throughput diukur satu per satu, dan hasilnya
+berupa satu tabel perbandingan yang di-log kembali ke MLflow
+"""
+
+import os
+import argparse
+import numpy as np
+import pandas as pd
+import psutil
+import mlflow
+from mlflow.tracking import MlflowClient
+from concurrent.futures import ProcessPoolExecutor
+
+from preprocessAPI import LABEL_MAPPING
+from shared_array import share_array, attach_array, release
+from latency import measure_latency
+
+TRACKING_URI = "http://127.0.0.1:5000/"
+
+# Perkiraan memori model saat dimuat relatif terhadap ukuran artefak di disk
+MODEL_MEMORY_FACTOR = 3
+
+_worker_data = {}
+
+
+def _init_worker(specs, column_groups, columns):
+    """
+    Initializer worker: attach ke data test di shared memory
+
+    Args:
+        specs (dict): Spec shared memory untuk 'X_int', 'X_float', dan 'y'
+        column_groups (dict): 'X_int'/'X_float' -> nama kolom di blok tersebut
+        columns (list): Urutan kolom fitur sesuai signature model
+    """
+    mlflow.set_tracking_uri(TRACKING_URI)
+    for key, spec in specs.items():
+        _worker_data[key] = attach_array(spec)
+    _worker_data["column_groups"] = column_groups
+    _worker_data["columns"] = columns
+
+
+def classification_metrics(y_true, y_pred, n_classes):
+    """
+    Menghitung akurasi, metrik per kelas, dan confusion matrix secara vektor
+
+    Args:
+        y_true (numpy.ndarray): Label sebenarnya (kode integer)
+        y_pred (numpy.ndarray): Label prediksi (kode integer)
+        n_classes (int): Jumlah kelas
+
+    Returns:
+        dict: accuracy, precision/recall/f1 per kelas, macro f1, dan confusion matrix
+    """
+    # Baris = label sebenarnya, kolom = prediksi
+    confusion = np.bincount(
+        y_true * n_classes + y_pred, minlength=n_classes * n_classes
+    ).reshape(n_classes, n_classes)
+
+    true_positive = np.diag(confusion).astype(np.float64)
+    predicted = confusion.sum(axis=0)
+    actual = confusion.sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted > 0, true_positive / predicted, 0.0)
+        recall = np.where(actual > 0, true_positive / actual, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+
+    return {
+        "accuracy": true_positive.sum() / confusion.sum(),
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "macro_f1": f1.mean(),
+        "confusion_matrix": confusion,
+    }
+
+
+def _test_frame():
+    """
+    Menyusun ulang DataFrame test dari shared memory dengan dtype asli: signature model
+    mengetik kolom kategorikal sebagai long, dan schema enforcement pyfunc menolak float64 -> long
+
+    Returns:
+        Pandas DataFrame: Fitur test dengan urutan kolom sesuai signature model
+    """
+    parts = [
+        pd.DataFrame(_worker_data[key][1], columns=names)
+        for key, names in _worker_data["column_groups"].items()
+    ]
+    return pd.concat(parts, axis=1)[_worker_data["columns"]]
+
+
+def evaluate_run(run_id):
+    """
+    Memuat model dari satu run dan mengevaluasinya terhadap data test di shared memory
+
+    Args:
+        run_id (str): ID run MLflow
+
+    Returns:
+        dict: Metrik evaluasi dan confusion matrix
+    """
+    y = _worker_data["y"][1]
+
+    model = mlflow.pyfunc.load_model(f"runs:/{run_id}/model")
+    y_pred = np.asarray(model.predict(_test_frame())).astype(np.int64)
+    n_classes = max(len(LABEL_MAPPING), int(y.max()) + 1, int(y_pred.max()) + 1)
+    metrics = classification_metrics(y, y_pred, n_classes)
+    metrics["run_id"] = run_id
+    return metrics
+
+
+def measure_run(run_id):
+    """
+    Mengukur latency dan throughput predict satu model; dijalankan di pool satu worker
+    agar angka antar model bisa dibandingkan
+
+    Args:
+        run_id (str): ID run MLflow
+
+    Returns:
+        dict: Metrik latency dari measure_latency
+    """
+    model = mlflow.pyfunc.load_model(f"runs:/{run_id}/model")
+    return measure_latency(model, _test_frame(), n_repeats=20)
+
+
+def artifact_size(client, run_id, path="model"):
+    """
+    Menghitung total ukuran artefak model sebuah run (byte)
+
+    Args:
+        client (MlflowClient): Client MLflow
+        run_id (str): ID run
+        path (str): Path artefak
+
+    Returns:
+        int: Total ukuran file
+    """
+    total = 0
+    for info in client.list_artifacts(run_id, path):
+        if info.is_dir:
+            total += artifact_size(client, run_id, info.path)
+        else:
+            total += info.file_size or 0
+    return total
+
+
+def max_parallel_models(client, run_ids):
+    """
+    Menentukan jumlah worker agar model yang dimuat bersamaan muat di memori yang tersedia
+
+    Args:
+        client (MlflowClient): Client MLflow
+        run_ids (list): Daftar run yang dievaluasi
+
+    Returns:
+        int: Jumlah worker
+    """
+    largest = max(artifact_size(client, run_id) for run_id in run_ids)
+    budget = psutil.virtual_memory().available * 0.7
+    by_memory = int(budget // max(largest * MODEL_MEMORY_FACTOR, 1))
+    return max(1, min(len(run_ids), os.cpu_count() or 1, by_memory))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluasi beberapa run MLflow terhadap held-out set")
+    parser.add_argument("run_ids", nargs="*", help="Daftar run_id yang dibandingkan")
+    parser.add_argument("--experiment", help="Evaluasi semua run di experiment ini")
+    parser.add_argument("--dataset", default="test_pca.csv")
+    args = parser.parse_args()
+
+    mlflow.set_tracking_uri(TRACKING_URI)
+    client = MlflowClient()
+
+    run_ids = list(args.run_ids)
+    if args.experiment:
+        experiment = client.get_experiment_by_name(args.experiment)
+        if experiment is None:
+            parser.error(f"Experiment tidak ditemukan: {args.experiment}")
+        runs = mlflow.search_runs(experiment_ids=[experiment.experiment_id], output_format="list")
+        # Hanya run yang punya artefak model
+        run_ids += [
+            run.info.run_id for run in runs
+            if client.list_artifacts(run.info.run_id, "model")
+        ]
+    run_ids = list(dict.fromkeys(run_ids))
+    if not run_ids:
+        parser.error("Berikan minimal satu run_id atau --experiment")
+
+    data = pd.read_csv(args.dataset)
+    features = data.drop("Credit_Score", axis=1)
+    columns = features.columns.tolist()
+
+    # Kolom integer dan float dibagikan sebagai dua blok terpisah agar dtype-nya tetap
+    column_groups = {
+        "X_int": features.select_dtypes(include="integer").columns.tolist(),
+        "X_float": features.select_dtypes(exclude="integer").columns.tolist(),
+    }
+    column_groups = {key: names for key, names in column_groups.items() if names}
+    blocks, specs = [], {}
+    for key, names in column_groups.items():
+        dtype = np.int64 if key == "X_int" else np.float64
+        shm, specs[key] = share_array(features[names].to_numpy(dtype=dtype))
+        blocks.append(shm)
+    y_shm, specs["y"] = share_array(data["Credit_Score"].to_numpy(dtype=np.int64))
+    blocks.append(y_shm)
+
+    n_workers = max_parallel_models(client, run_ids)
+    print(f"[EVALUASI] {len(run_ids)} model, {len(data)} baris test, {n_workers} worker")
+
+    results = []
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,
+            initargs=(specs, column_groups, columns),
+        ) as executor:
+            for run_id, future in [(r, executor.submit(evaluate_run, r)) for r in run_ids]:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    print(f"✗ Run {run_id} gagal dievaluasi: {str(e)}")
+
+        # Throughput diukur setelah semua evaluasi selesai, satu model pada satu waktu,
+        # supaya tidak bersaing CPU dengan worker lain yang sedang memuat/predict
+        with ProcessPoolExecutor(
+            max_workers=1,
+            initializer=_init_worker,
+            initargs=(specs, column_groups, columns),
+        ) as executor:
+            for result in results:
+                try:
+                    result.update(executor.submit(measure_run, result["run_id"]).result())
+                except Exception as e:
+                    print(f"✗ Throughput run {result['run_id']} gagal diukur: {str(e)}")
+                    result.update(latency_batch_ms=np.nan, throughput_rows_per_s=np.nan)
+    finally:
+        release(*blocks)
+
+    if not results:
+        print("✗ Tidak ada model yang berhasil dievaluasi")
+        return
+
+    # Satu baris per model dalam tabel perbandingan
+    rows = []
+    for result in results:
+        row = {
+            "run_id": result["run_id"],
+            "accuracy": result["accuracy"],
+            "macro_f1": result["macro_f1"],
+            "latency_batch_ms": result["latency_batch_ms"],
+            "throughput_rows_per_s": result["throughput_rows_per_s"],
+        }
+        for code, label in LABEL_MAPPING.items():
+            if code < len(result["f1"]):
+                row[f"precision_{label}"] = result["precision"][code]
+                row[f"recall_{label}"] = result["recall"][code]
+                row[f"f1_{label}"] = result["f1"][code]
+        rows.append(row)
+
+    comparison = pd.DataFrame(rows).sort_values("accuracy", ascending=False)
+    print("\n" + "=" * 60)
+    print("PERBANDINGAN MODEL")
+    print("=" * 60)
+    print(comparison.to_string(index=False))
+
+    mlflow.set_experiment(args.experiment or "Latihan Credit Scoring")
+    with mlflow.start_run(run_name="model-comparison"):
+        mlflow.log_param("dataset", args.dataset)
+        mlflow.log_param("n_models", len(results))
+        mlflow.log_table(comparison, artifact_file="comparison.json")
+        mlflow.log_dict(
+            {r["run_id"]: r["confusion_matrix"].tolist() for r in results},
+            "confusion_matrices.json",
+        )
+
+    print("\n✓ Tabel perbandingan tersimpan di MLflow (comparison.json)")
+
+
+if __name__ == "__main__":
+    main()
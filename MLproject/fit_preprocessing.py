@@ -0,0 +1,240 @@
+"""
+Script untuk fit statistik preprocessing (mean, std, komponen PCA) dari data mentah berukuran besar
+Data CSV dibaca per chunk sekali jalan (out-of-core), tiap shard file bisa diproses paralel,
+dan state parsial digabung dengan rumus Chan et al. agar tetap stabil secara numerik
+"""
+
+import sys
+import json
+import glob
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+# Grup fitur yang sama dengan data_preprocessing di preprocessAPI.py
+PCA_FEATURES_1 = [
+    'Num_Bank_Accounts', 'Num_Credit_Card', 'Interest_Rate',
+    'Num_of_Loan', 'Delay_from_due_date', 'Num_of_Delayed_Payment'
+]
+PCA_FEATURES_2 = [
+    'Changed_Credit_Limit', 'Num_Credit_Inquiries', 'Outstanding_Debt',
+    'Monthly_Inhand_Salary', 'Monthly_Balance', 'Amount_invested_monthly',
+    'Total_EMI_per_month'
+]
+N_COMPONENTS_1 = 5
+N_COMPONENTS_2 = 2
+
+
+class MomentAccumulator:
+    """
+    Akumulator jumlah data, mean, dan co-moment (jumlah hasil kali deviasi) per grup fitur
+    State dari shard berbeda bisa digabung dengan merge()
+    """
+
+    def __init__(self, n_features):
+        self.count = 0
+        self.mean = np.zeros(n_features)
+        self.comoment = np.zeros((n_features, n_features))
+
+    def update(self, X):
+        """
+        Menambahkan satu chunk data ke akumulator
+
+        Args:
+            X (numpy.ndarray): Chunk data dengan shape (n_baris, n_fitur)
+        """
+        if len(X) == 0:
+            return
+        chunk = MomentAccumulator(X.shape[1])
+        chunk.count = len(X)
+        chunk.mean = X.mean(axis=0)
+        centered = X - chunk.mean
+        chunk.comoment = centered.T @ centered
+        self.merge(chunk)
+
+    def merge(self, other):
+        """
+        Menggabungkan state akumulator lain (misalnya dari shard lain) ke akumulator ini
+
+        Args:
+            other (MomentAccumulator): Akumulator yang akan digabung
+        """
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count = other.count
+            self.mean = other.mean.copy()
+            self.comoment = other.comoment.copy()
+            return
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.comoment = (
+            self.comoment + other.comoment
+            + np.outer(delta, delta) * (self.count * other.count / total)
+        )
+        self.mean = self.mean + delta * (other.count / total)
+        self.count = total
+
+    @property
+    def covariance(self):
+        """Matriks kovarians populasi (ddof=0, sama seperti StandardScaler)"""
+        return self.comoment / self.count
+
+    @property
+    def std(self):
+        """Standar deviasi populasi per fitur"""
+        return np.sqrt(np.diag(self.covariance))
+
+
+def _clean_numeric(chunk, features):
+    """
+    Mengubah kolom fitur menjadi numerik dan membuang baris yang tidak valid
+
+    Args:
+        chunk (Pandas DataFrame): Chunk data mentah
+        features (list): Kolom yang dipakai
+
+    Returns:
+        numpy.ndarray: Array float64 tanpa NaN/inf
+    """
+    values = chunk[features].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    return values[np.isfinite(values).all(axis=1)]
+
+
+def fit_shard(path, chunksize=100_000):
+    """
+    Membaca satu file CSV per chunk dan mengakumulasi statistik kedua grup fitur
+
+    Args:
+        path (str): Path file CSV mentah
+        chunksize (int): Jumlah baris per chunk
+
+    Returns:
+        tuple: (MomentAccumulator grup 1, MomentAccumulator grup 2)
+    """
+    acc_1 = MomentAccumulator(len(PCA_FEATURES_1))
+    acc_2 = MomentAccumulator(len(PCA_FEATURES_2))
+
+    for chunk in pd.read_csv(
+        path, usecols=PCA_FEATURES_1 + PCA_FEATURES_2, chunksize=chunksize, low_memory=False
+    ):
+        acc_1.update(_clean_numeric(chunk, PCA_FEATURES_1))
+        acc_2.update(_clean_numeric(chunk, PCA_FEATURES_2))
+
+    return acc_1, acc_2
+
+
+def principal_components(acc, n_components):
+    """
+    Menghitung komponen PCA dari data yang sudah distandardisasi,
+    yaitu eigenvector matriks korelasi
+
+    Args:
+        acc (MomentAccumulator): Akumulator grup fitur
+        n_components (int): Jumlah komponen yang diambil
+
+    Returns:
+        tuple: (komponen dengan shape (n_components, n_fitur), explained variance ratio)
+    """
+    std = acc.std
+    std = np.where(std == 0, 1.0, std)
+    correlation = acc.covariance / np.outer(std, std)
+
+    eigenvalues, eigenvectors = np.linalg.eigh(correlation)
+    order = np.argsort(eigenvalues)[::-1][:n_components]
+    components = eigenvectors[:, order].T
+
+    # Tanda eigenvector tidak unik: samakan agar loading absolut terbesar bernilai positif
+    max_idx = np.argmax(np.abs(components), axis=1)
+    signs = np.sign(components[np.arange(len(components)), max_idx])
+    components = components * signs[:, None]
+
+    explained_ratio = eigenvalues[order] / eigenvalues.sum()
+    return components, explained_ratio
+
+
+def fit_preprocessing(paths, n_workers=4, chunksize=100_000):
+    """
+    Fit statistik preprocessing dari beberapa shard CSV secara paralel
+
+    Args:
+        paths (list): Daftar path file CSV mentah
+        n_workers (int): Jumlah proses worker
+        chunksize (int): Jumlah baris per chunk
+
+    Returns:
+        dict: Mean, std, dan komponen PCA untuk kedua grup fitur
+
+    Raises:
+        ValueError: Jika salah satu grup fitur tidak memiliki baris valid
+    """
+    acc_1 = MomentAccumulator(len(PCA_FEATURES_1))
+    acc_2 = MomentAccumulator(len(PCA_FEATURES_2))
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        for shard_1, shard_2 in executor.map(fit_shard, paths, [chunksize] * len(paths)):
+            acc_1.merge(shard_1)
+            acc_2.merge(shard_2)
+
+    # Tanpa baris valid, kovarians dan PCA tidak bisa dihitung
+    for group, acc in (("1", acc_1), ("2", acc_2)):
+        if acc.count == 0:
+            raise ValueError(f"Tidak ada baris numerik valid untuk grup fitur {group}")
+
+    components_1, explained_1 = principal_components(acc_1, N_COMPONENTS_1)
+    components_2, explained_2 = principal_components(acc_2, N_COMPONENTS_2)
+
+    return {
+        "n_rows_1": acc_1.count,
+        "n_rows_2": acc_2.count,
+        "means_1": acc_1.mean.tolist(),
+        "stds_1": acc_1.std.tolist(),
+        "components_1": components_1.tolist(),
+        "explained_variance_ratio_1": explained_1.tolist(),
+        "means_2": acc_2.mean.tolist(),
+        "stds_2": acc_2.std.tolist(),
+        "components_2": components_2.tolist(),
+        "explained_variance_ratio_2": explained_2.tolist(),
+    }
+
+
+def load_preprocessing_stats(path="preprocessing_stats.json"):
+    """
+    Memuat statistik preprocessing hasil fit_preprocessing
+
+    Args:
+        path (str): Path file JSON
+
+    Returns:
+        dict: Statistik preprocessing
+    """
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    # Contoh: python fit_preprocessing.py "raw/*.csv" preprocessing_stats.json 4
+    pattern = sys.argv[1] if len(sys.argv) > 1 else "raw/*.csv"
+    output_path = sys.argv[2] if len(sys.argv) > 2 else "preprocessing_stats.json"
+    n_workers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+
+    paths = sorted(glob.glob(pattern))
+    if not paths:
+        print(f"✗ Tidak ada file yang cocok dengan pola: {pattern}")
+        sys.exit(1)
+
+    print(f"[FIT] Memproses {len(paths)} shard dengan {n_workers} worker...")
+    try:
+        stats = fit_preprocessing(paths, n_workers=n_workers)
+    except ValueError as e:
+        print(f"✗ {str(e)}")
+        sys.exit(1)
+
+    with open(output_path, 'w') as f:
+        json.dump(stats, f, indent=2)
+
+    print("✓ Statistik preprocessing tersimpan!")
+    print(f"  Baris valid grup 1: {stats['n_rows_1']}")
+    print(f"  Baris valid grup 2: {stats['n_rows_2']}")
+    print(f"  Output: {output_path}")
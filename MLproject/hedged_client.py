@@ -0,0 +1,281 @@
+"""
+Client HTTP dengan deadline end-to-end dan hedged request ke beberapa replika model server
+Jika replika pertama belum menjawab setelah persentil latency terbaru (misalnya p95),
+request duplikat dikirim ke replika berikutnya; jawaban tercepat dipakai dan sisanya dibatalkan
+"""
+
+import json
+import time
+import socket
+import threading
+import http.client
+from collections import deque
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy as np
+
+from metrics import REGISTRY
+
+
+class DeadlineExceeded(Exception):
+    """Request tidak selesai sebelum deadline"""
+
+
+class HedgedResponse:
+    """Response minimal dengan atribut yang dipakai prediction() (mirip requests.Response)"""
+
+    def __init__(self, status_code, content, url):
+        self.status_code = status_code
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+# Skema URL -> (kelas koneksi, port default)
+_CONNECTION_CLASSES = {
+    "http": (http.client.HTTPConnection, 80),
+    "https": (http.client.HTTPSConnection, 443),
+}
+
+
+class _Attempt:
+    """Satu request ke satu replika; socket-nya bisa ditutup dari thread lain untuk membatalkan"""
+
+    def __init__(self, url):
+        self.url = url
+        self._parts = urlsplit(url)
+        if self._parts.scheme not in _CONNECTION_CLASSES:
+            raise ValueError(f"Skema URL tidak didukung (hanya http/https): {url}")
+        self._conn = None
+        self._cancelled = threading.Event()
+
+    def run(self, body, headers, deadline):
+        parts = self._parts
+        bounded = deadline != float("inf")
+        remaining = deadline - time.monotonic() if bounded else None
+        if bounded and remaining <= 0:
+            raise DeadlineExceeded(self.url)
+
+        # Timeout socket dibatasi sisa waktu untuk connect, send, dan setiap read;
+        # tanpa deadline socket dibiarkan blocking (settimeout tidak menerima inf)
+        connection_class, default_port = _CONNECTION_CLASSES[parts.scheme]
+        self._conn = connection_class(parts.hostname, parts.port or default_port, timeout=remaining)
+        try:
+            self._conn.connect()
+            if self._cancelled.is_set():
+                raise DeadlineExceeded(self.url)
+            if bounded:
+                self._conn.sock.settimeout(max(deadline - time.monotonic(), 0.001))
+            path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+            self._conn.request("POST", path, body=body, headers=headers)
+            response = self._conn.getresponse()
+            content = response.read()
+            return HedgedResponse(response.status, content, self.url)
+        finally:
+            self._conn.close()
+
+    def cancel(self):
+        """Membatalkan request yang sedang berjalan dengan mematikan socket-nya"""
+        self._cancelled.set()
+        conn = self._conn
+        if conn is not None and conn.sock is not None:
+            try:
+                conn.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+# Thread untuk request dengan deadline tanpa HedgedClient (lihat post_with_deadline)
+_deadline_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="deadline")
+
+
+def post_with_deadline(url, body, headers, deadline):
+    """
+    POST ke satu URL yang dibatasi deadline end-to-end: connect, send, dan read bersama-sama.
+    Jika deadline lewat, socket ditutup sehingga server yang lambat/mengirim byte sedikit-sedikit
+    tidak bisa menahan pemanggil melewati deadline
+
+    Args:
+        url (str): URL endpoint
+        body (str/bytes): Body request
+        headers (dict): Header HTTP
+        deadline (float): Batas waktu absolut (time.monotonic())
+
+    Returns:
+        HedgedResponse: Response dari server
+
+    Raises:
+        DeadlineExceeded: Jika tidak ada jawaban sebelum deadline
+        ValueError: Jika skema URL bukan http/https
+    """
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    attempt = _Attempt(url)
+    future = _deadline_executor.submit(attempt.run, body, headers, deadline)
+    done, _ = wait([future], timeout=max(deadline - time.monotonic(), 0))
+    if not done:
+        attempt.cancel()
+        raise DeadlineExceeded(url)
+    return future.result()
+
+
+class HedgedClient:
+    """
+    Contoh:
+        client = HedgedClient([
+            "http://10.0.0.1:5004/invocations",
+            "http://10.0.0.2:5004/invocations",
+        ])
+        labels = prediction(payload, deadline=time.monotonic() + 0.3, client=client)
+    """
+
+    def __init__(self, urls, hedge_percentile=95, initial_hedge_delay=0.05,
+                 window=500, min_samples=20, max_hedges=1, max_workers=16):
+        """
+        Args:
+            urls (list): URL /invocations setiap replika
+            hedge_percentile (float): Persentil latency terbaru sebagai batas waktu sebelum hedge
+            initial_hedge_delay (float): Batas waktu hedge (detik) sebelum sampel latency cukup
+            window (int): Jumlah sampel latency terbaru yang disimpan
+            min_samples (int): Sampel minimum sebelum memakai persentil
+            max_hedges (int): Jumlah request duplikat maksimum per panggilan
+            max_workers (int): Jumlah thread untuk request yang berjalan bersamaan
+
+        Raises:
+            ValueError: Jika urls kosong atau ada URL dengan skema selain http/https
+        """
+        self.urls = list(urls)
+        if not self.urls:
+            raise ValueError("HedgedClient membutuhkan minimal satu URL replika")
+        for url in self.urls:
+            _Attempt(url)  # validasi skema sejak awal, bukan saat request pertama
+        self.hedge_percentile = hedge_percentile
+        self.initial_hedge_delay = initial_hedge_delay
+        self.min_samples = min_samples
+        self.max_hedges = max_hedges
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._next_replica = 0
+        self._requests = 0
+        self._hedges = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+
+    def hedge_delay(self):
+        """Batas waktu menunggu replika pertama sebelum mengirim hedge"""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.initial_hedge_delay
+            return float(np.percentile(self._latencies, self.hedge_percentile))
+
+    @property
+    def hedge_rate(self):
+        """Rasio panggilan yang memicu hedge"""
+        with self._lock:
+            return self._hedges / self._requests if self._requests else 0.0
+
+    def _pick_replicas(self):
+        # Round-robin supaya beban replika pertama tersebar
+        with self._lock:
+            start = self._next_replica
+            self._next_replica = (start + 1) % len(self.urls)
+        return self.urls[start:] + self.urls[:start]
+
+    def post(self, body, headers=None, deadline=None):
+        """
+        Mengirim POST dengan hedging, dibatasi deadline
+
+        Args:
+            body (str/bytes): Body request
+            headers (dict): Header HTTP
+            deadline (float): Batas waktu absolut (time.monotonic()); None = tanpa batas
+
+        Returns:
+            HedgedResponse: Response pertama yang selesai tanpa error
+
+        Raises:
+            DeadlineExceeded: Jika tidak ada jawaban sebelum deadline
+        """
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        headers = headers or {"Content-Type": "application/json"}
+        deadline = deadline if deadline is not None else float("inf")
+        replicas = self._pick_replicas()
+
+        with self._lock:
+            self._requests += 1
+        REGISTRY.inc("hedged_client_requests_total")
+
+        start = time.monotonic()
+        pending = {}
+        attempts = []
+        last_error = None
+
+        def launch(url):
+            attempt = _Attempt(url)
+            attempts.append(attempt)
+            pending[self._executor.submit(attempt.run, body, headers, deadline)] = attempt
+
+        launch(replicas[0])
+        hedges_left = min(self.max_hedges, len(replicas) - 1)
+        next_hedge_at = start + self.hedge_delay()
+
+        try:
+            while pending:
+                now = time.monotonic()
+                if now >= deadline:
+                    break
+                timeout = deadline - now if deadline != float("inf") else None
+                if hedges_left:
+                    hedge_wait = max(next_hedge_at - now, 0)
+                    timeout = hedge_wait if timeout is None else min(timeout, hedge_wait)
+
+                done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    attempt = pending.pop(future)
+                    try:
+                        response = future.result()
+                    except Exception as e:
+                        last_error = e
+                        continue
+                    self._record(time.monotonic() - start, hedged=len(attempts) > 1,
+                                 won_by_hedge=attempt is not attempts[0])
+                    return response
+
+                # Kirim hedge jika batas waktu lewat atau semua attempt sebelumnya gagal
+                if hedges_left and (time.monotonic() >= next_hedge_at or not pending):
+                    launch(replicas[len(attempts)])
+                    hedges_left -= 1
+                    next_hedge_at = time.monotonic() + self.hedge_delay()
+        finally:
+            # Batalkan request yang kalah / masih berjalan
+            for attempt in pending.values():
+                attempt.cancel()
+
+        self._record(None, hedged=len(attempts) > 1, won_by_hedge=False)
+        if pending or time.monotonic() >= deadline:
+            REGISTRY.inc("hedged_client_deadline_exceeded_total")
+            raise DeadlineExceeded(f"Tidak ada jawaban sebelum deadline dari {len(attempts)} replika")
+        raise last_error
+
+    def _record(self, latency, hedged, won_by_hedge):
+        with self._lock:
+            if latency is not None:
+                self._latencies.append(latency)
+            if hedged:
+                self._hedges += 1
+        if hedged:
+            REGISTRY.inc("hedged_client_hedges_total")
+        if won_by_hedge:
+            REGISTRY.inc("hedged_client_hedge_wins_total")
+        if latency is not None:
+            REGISTRY.observe("hedged_client_latency_seconds", latency)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,149 @@
+"""
+Script training inkremental: menumbuhkan forest dari run MLflow sebelumnya dengan data terbaru
+Pohon baru di-fit hanya pada data baru (warm_start), pohon tertua bisa dipensiunkan,
+dan hasilnya di-log sebagai versi model baru dengan lineage ke run induknya
+"""
+
+import sys
+import time
+import mlflow
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+mlflow.set_tracking_uri("http://127.0.0.1:5000/")
+mlflow.set_experiment("Latihan Credit Scoring")
+
+
+def validate_tree_counts(model, n_new_trees, n_retire):
+    """
+    Memastikan jumlah pohon baru dan pohon yang dipensiunkan valid untuk forest induk
+
+    Args:
+        model (RandomForestClassifier): Forest induk yang sudah di-fit
+        n_new_trees (int): Jumlah pohon baru
+        n_retire (int): Jumlah pohon tertua yang dibuang
+
+    Raises:
+        ValueError: Jika n_retire di luar [0, jumlah pohon induk], n_new_trees negatif,
+                    atau forest hasil akan kosong
+    """
+    if not 0 <= n_retire <= len(model.estimators_):
+        raise ValueError(
+            f"n_retire harus di antara 0 dan jumlah pohon induk ({len(model.estimators_)}), "
+            f"didapat {n_retire}"
+        )
+    if n_new_trees < 0 or len(model.estimators_) - n_retire + n_new_trees == 0:
+        raise ValueError("n_new_trees tidak boleh negatif dan forest hasil tidak boleh kosong")
+
+
+def grow_forest(model, X, y, n_new_trees, n_retire=0):
+    """
+    Menambah pohon baru pada RandomForest yang sudah di-fit, hanya memakai data baru
+
+    Args:
+        model (RandomForestClassifier): Forest induk yang sudah di-fit
+        X (Pandas DataFrame): Fitur data baru
+        y (Pandas Series): Label data baru
+        n_new_trees (int): Jumlah pohon baru
+        n_retire (int): Jumlah pohon tertua yang dibuang
+
+    Returns:
+        RandomForestClassifier: Forest yang sama (diubah in-place)
+    """
+    # Pohon lama dan baru harus memakai kelas dan fitur yang sama agar voting konsisten
+    new_classes = set(np.unique(y))
+    if new_classes != set(model.classes_):
+        raise ValueError(
+            f"Kelas pada data baru {sorted(new_classes)} tidak sama dengan kelas model induk "
+            f"{sorted(model.classes_)}"
+        )
+    if hasattr(model, "feature_names_in_") and list(X.columns) != list(model.feature_names_in_):
+        raise ValueError("Kolom data baru tidak sama dengan kolom saat training model induk")
+    validate_tree_counts(model, n_new_trees, n_retire)
+
+    # estimators_ terurut dari yang paling lama, jadi pohon tertua ada di depan
+    model.estimators_ = model.estimators_[n_retire:]
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_new_trees)
+    model.fit(X, y)
+    model.set_params(warm_start=False)
+    return model
+
+
+def main(parent_run_id, n_new_trees=50, n_retire=0, dataset="train_recent.csv",
+         model_name="credit-scoring"):
+    parent_model_uri = f"runs:/{parent_run_id}/model"
+    print(f"[INKREMENTAL] Memuat forest induk dari {parent_model_uri}...")
+    model = mlflow.sklearn.load_model(parent_model_uri)
+    n_parent_trees = len(model.estimators_)
+
+    # Validasi sebelum membuat run, agar tidak ada run dengan lineage/parameter yang salah
+    try:
+        validate_tree_counts(model, n_new_trees, n_retire)
+    except ValueError as e:
+        print(f"✗ {str(e)}")
+        sys.exit(1)
+
+    data = pd.read_csv(dataset)
+    X_train, X_test, y_train, y_test = train_test_split(
+        data.drop("Credit_Score", axis=1),
+        data["Credit_Score"],
+        random_state=42,
+        test_size=0.2
+    )
+    input_example = X_train[0:5]
+
+    parent_accuracy = model.score(X_test, y_test)
+
+    with mlflow.start_run(run_name="incremental"):
+        mlflow.set_tags({
+            "training_mode": "incremental",
+            "parent_run_id": parent_run_id,
+            "parent_model_uri": parent_model_uri,
+        })
+        mlflow.log_params({
+            "parent_run_id": parent_run_id,
+            "n_parent_trees": n_parent_trees,
+            "n_new_trees": n_new_trees,
+            "n_retired_trees": n_retire,
+            "dataset": dataset,
+            "n_rows_new": len(X_train),
+        })
+
+        start = time.perf_counter()
+        grow_forest(model, X_train, y_train, n_new_trees, n_retire)
+        fit_seconds = time.perf_counter() - start
+
+        accuracy = model.score(X_test, y_test)
+        mlflow.log_metrics({
+            "accuracy": accuracy,
+            "parent_accuracy_on_new_data": parent_accuracy,
+            "fit_seconds": fit_seconds,
+            "n_estimators": len(model.estimators_),
+        })
+
+        mlflow.sklearn.log_model(
+            sk_model=model,
+            artifact_path="model",
+            input_example=input_example,
+            registered_model_name=model_name
+        )
+
+    print("✓ Training inkremental selesai!")
+    print(f"  Pohon: {n_parent_trees} - {n_retire} + {n_new_trees} = {len(model.estimators_)}")
+    print(f"  Akurasi induk pada data baru: {parent_accuracy:.4f}")
+    print(f"  Akurasi model baru: {accuracy:.4f}")
+
+
+if __name__ == "__main__":
+    # Contoh: python incremental_training.py <parent_run_id> 50 25 train_recent.csv
+    if len(sys.argv) < 2:
+        print("Penggunaan: python incremental_training.py <parent_run_id> [n_new_trees] [n_retire] [dataset]")
+        sys.exit(1)
+
+    main(
+        parent_run_id=sys.argv[1],
+        n_new_trees=int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+        n_retire=int(sys.argv[3]) if len(sys.argv) > 3 else 0,
+        dataset=sys.argv[4] if len(sys.argv) > 4 else "train_recent.csv",
+    )
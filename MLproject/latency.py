@@ -0,0 +1,40 @@
+"""
+Helper untuk mengukur latency dan throughput predict sebuah model
+Dipakai oleh script yang membandingkan model (tuning, evaluasi); pengukuran sebaiknya
+dijalankan satu per satu agar hasilnya tidak dipengaruhi proses lain yang sedang bekerja
+"""
+
+import time
+import numpy as np
+
+
+def measure_latency(model, X, n_repeats=50):
+    """
+    Mengukur latency predict untuk satu baris dan untuk satu batch
+
+    Args:
+        model: Model dengan method predict
+        X (numpy.ndarray/Pandas DataFrame): Data yang dipakai untuk mengukur
+        n_repeats (int): Jumlah pengulangan untuk prediksi satu baris
+
+    Returns:
+        dict: Median latency satu baris (ms), latency batch (ms), dan throughput (baris/detik)
+    """
+    single_row = X[:1]
+    model.predict(single_row)  # warm-up
+
+    timings = []
+    for _ in range(n_repeats):
+        start = time.perf_counter()
+        model.predict(single_row)
+        timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    model.predict(X)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "latency_single_ms": float(np.median(timings) * 1000),
+        "latency_batch_ms": batch_seconds * 1000,
+        "throughput_rows_per_s": len(X) / batch_seconds if batch_seconds > 0 else float("inf"),
+    }
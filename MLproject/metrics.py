@@ -0,0 +1,260 @@
+"""
+Instrumentasi ringan untuk jalur inference (tanpa dependency tambahan)
+Menyediakan histogram latency per tahap, counter (baris, byte, error, retry),
+snapshot in-process, endpoint teks format Prometheus, dan sampling profiler opsional
+"""
+
+import sys
+import time
+import threading
+import functools
+import traceback
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Batas bucket histogram latency (detik), mengikuti default client Prometheus
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Histogram kumulatif dengan bucket tetap"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """List pasangan (batas bucket, jumlah observasi <= batas)"""
+        total, result = 0, []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class MetricsRegistry:
+    """Penyimpanan semua metrik; aman dipakai dari beberapa thread"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        """
+        Mengambil salinan semua metrik saat ini
+
+        Returns:
+            dict: {"counters": [...], "histograms": [...]} dengan nama, label, dan nilai
+        """
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in self._counters.items()
+            ]
+            histograms = [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": h.count,
+                    "sum": h.sum,
+                    "buckets": h.cumulative(),
+                }
+                for (name, labels), h in self._histograms.items()
+            ]
+        return {"counters": counters, "histograms": histograms}
+
+    def render_prometheus(self):
+        """
+        Menyusun semua metrik dalam format teks Prometheus (exposition format 0.0.4)
+
+        Returns:
+            str: Teks metrik
+        """
+        snap = self.snapshot()
+        lines = []
+
+        for name in sorted({c["name"] for c in snap["counters"]}):
+            lines.append(f"# TYPE {name} counter")
+            for c in snap["counters"]:
+                if c["name"] == name:
+                    lines.append(f"{name}{_format_labels(c['labels'])} {c['value']}")
+
+        for name in sorted({h["name"] for h in snap["histograms"]}):
+            lines.append(f"# TYPE {name} histogram")
+            for h in snap["histograms"]:
+                if h["name"] != name:
+                    continue
+                for bound, count in h["buckets"]:
+                    labels = _format_labels({**h["labels"], "le": repr(float(bound))})
+                    lines.append(f"{name}_bucket{labels} {count}")
+                labels = _format_labels({**h["labels"], "le": "+Inf"})
+                lines.append(f"{name}_bucket{labels} {h['count']}")
+                lines.append(f"{name}_sum{_format_labels(h['labels'])} {h['sum']}")
+                lines.append(f"{name}_count{_format_labels(h['labels'])} {h['count']}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    parts = []
+    for key, value in sorted(labels.items()):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+# Registry global yang dipakai preprocessAPI
+REGISTRY = MetricsRegistry()
+
+
+def timed(stage):
+    """
+    Decorator untuk mencatat latency dan error sebuah tahap inference
+
+    Args:
+        stage (str): Nama tahap, dipakai sebagai label 'stage'
+
+    Returns:
+        function: Decorator
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                REGISTRY.inc("inference_errors_total", stage=stage, reason="exception")
+                raise
+            finally:
+                REGISTRY.observe(
+                    "inference_stage_latency_seconds", time.perf_counter() - start, stage=stage
+                )
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    """Snapshot metrik in-process dari registry global"""
+    return REGISTRY.snapshot()
+
+
+def render_prometheus():
+    """Teks format Prometheus dari registry global"""
+    return REGISTRY.render_prometheus()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Jangan tulis access log untuk setiap scrape
+        pass
+
+
+def start_metrics_server(port=8000, host="127.0.0.1"):
+    """
+    Menjalankan endpoint /metrics di background thread
+
+    Args:
+        port (int): Port HTTP
+        host (str): Alamat bind
+
+    Returns:
+        ThreadingHTTPServer: Server yang berjalan (panggil shutdown() untuk berhenti)
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+class SamplingProfiler:
+    """
+    Sampling profiler sederhana: secara periodik mengambil stack semua thread
+    dan menghitung fungsi yang paling sering sedang berjalan (hotspot)
+
+    Contoh:
+        profiler = SamplingProfiler(interval=0.005)
+        profiler.start()
+        ...  # beban inference
+        profiler.stop()
+        print(profiler.top(10))
+    """
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                summary = traceback.extract_stack(frame, limit=1)
+                if summary:
+                    entry = summary[-1]
+                    self.samples[f"{entry.filename}:{entry.lineno} ({entry.name})"] += 1
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def top(self, n=20):
+        """
+        Args:
+            n (int): Jumlah hotspot
+
+        Returns:
+            list: Pasangan (lokasi, jumlah sampel) terurut dari yang terbanyak
+        """
+        return self.samples.most_common(n)
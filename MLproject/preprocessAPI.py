@@ -8,29 +8,47 @@ import numpy as np
 import requests
 import json
 import joblib
+import time
+import logging
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 from sklearn.decomposition import PCA
 
+from metrics import REGISTRY, timed
+from hedged_client import DeadlineExceeded, post_with_deadline
 
-def data_preprocessing(data):
+logger = logging.getLogger(__name__)
+
+# Decode hasil prediksi
+# 0 = Good, 1 = Poor, 2 = Standard (sesuai dengan LabelEncoder)
+LABEL_MAPPING = {0: "Good", 1: "Poor", 2: "Standard"}
+
+# URL endpoint default dari model yang sedang di-serve
+DEFAULT_MODEL_URL = "http://127.0.0.1:5004/invocations"
+
+
+@timed("data_preprocessing")
+def data_preprocessing(data, stats=None):
     """
     Melakukan preprocessing pada data mentah sebelum prediksi
     CATATAN: Untuk production, seharusnya load model PCA/Scaler yang sudah di-fit saat training
-    Karena tidak ada file tersimpan, kita gunakan transformasi sederhana
+    Jika stats tidak diberikan, kita gunakan transformasi sederhana
     
     Args:
         data (Pandas DataFrame): DataFrame dengan data mentah dari user
+        stats (dict, optional): Mean, std, dan komponen PCA hasil fit_preprocessing.py
         
     Returns:
         Pandas DataFrame: Data yang sudah diproses dan siap untuk prediksi
     """
     
-    print("\n[PREPROCESSING] Memulai preprocessing data...")
-    print("  ⚠️  PERINGATAN: Menggunakan transformasi simplified (tanpa PCA fitted)")
-    print("     Untuk hasil optimal, load PCA/Scaler yang sudah di-fit saat training")
+    logger.debug("[PREPROCESSING] Memulai preprocessing data...")
+    if stats is None:
+        logger.debug("PERINGATAN: Menggunakan transformasi simplified (tanpa PCA fitted), "
+                     "untuk hasil optimal load PCA/Scaler yang sudah di-fit saat training")
+    REGISTRY.inc("inference_rows_total", len(data), stage="data_preprocessing")
     
     # 1. Label Encoding untuk fitur kategorikal
-    print("  1. Label Encoding untuk fitur kategorikal...")
+    logger.debug("1. Label Encoding untuk fitur kategorikal...")
     categorical_features = ['Credit_Mix', 'Payment_of_Min_Amount', 'Payment_Behaviour']
     
     # Mapping manual berdasarkan training data
@@ -52,8 +70,14 @@ def data_preprocessing(data):
     if 'Payment_Behaviour' in data.columns:
         data['Payment_Behaviour'] = data['Payment_Behaviour'].map(payment_behaviour_mapping).fillna(0)
     
+    # fillna membuat kolom menjadi float64 begitu ada satu nilai yang tidak dikenal (mis. '_'),
+    # sedangkan signature model mengetik kolom ini sebagai long
+    for col in categorical_features:
+        if col in data.columns:
+            data[col] = data[col].astype('int64')
+    
     # 2. Normalisasi Age (estimasi range: 18-80)
-    print("  2. Normalisasi Age (0-1)...")
+    logger.debug("2. Normalisasi Age (0-1)...")
     if 'Age' in data.columns:
         # Gunakan range fixed untuk konsistensi
         age_min, age_max = 18, 80
@@ -61,13 +85,17 @@ def data_preprocessing(data):
         data['Age'] = data['Age'].clip(0, 1)  # Pastikan dalam range [0, 1]
     
     # 3. Standardisasi dan dimensi reduction untuk grup fitur 1
-    print("  3. Transformasi grup fitur 1 (simplified)...")
+    logger.debug("3. Transformasi grup fitur 1 (%s)...", 'fitted' if stats is not None else 'simplified')
     pca_features_1 = [
         'Num_Bank_Accounts', 'Num_Credit_Card', 'Interest_Rate',
         'Num_of_Loan', 'Delay_from_due_date', 'Num_of_Delayed_Payment'
     ]
     
-    if all(col in data.columns for col in pca_features_1):
+    if all(col in data.columns for col in pca_features_1) and stats is not None:
+        # Standardisasi + PCA dengan statistik hasil fit
+        _apply_fitted_pca(data, pca_features_1, stats['means_1'], stats['stds_1'],
+                          stats['components_1'], prefix='pc1')
+    elif all(col in data.columns for col in pca_features_1):
         # Standardisasi sederhana (Z-score dengan mean/std estimasi)
         # Nilai-nilai ini harus diganti dengan mean/std dari training data yang sebenarnya
         means_1 = [4, 5, 8, 5, 15, 12]  # Estimasi mean
@@ -82,19 +110,23 @@ def data_preprocessing(data):
         data['pc1_3'] = 0.1 * data['Delay_from_due_date'] + 0.05 * data['Num_of_Delayed_Payment']
         data['pc1_4'] = -0.2 * data['Interest_Rate'] + 0.1 * data['Num_of_Loan']
         data['pc1_5'] = 0.1 * data['Num_Bank_Accounts'] + 0.05 * data['Num_Credit_Card']
-        
+    
+    if all(col in data.columns for col in pca_features_1):
         # Drop kolom asli
         data = data.drop(columns=pca_features_1)
     
     # 4. Standardisasi dan dimensi reduction untuk grup fitur 2
-    print("  4. Transformasi grup fitur 2 (simplified)...")
+    logger.debug("4. Transformasi grup fitur 2 (%s)...", 'fitted' if stats is not None else 'simplified')
     pca_features_2 = [
         'Changed_Credit_Limit', 'Num_Credit_Inquiries', 'Outstanding_Debt',
         'Monthly_Inhand_Salary', 'Monthly_Balance', 'Amount_invested_monthly',
         'Total_EMI_per_month'
     ]
     
-    if all(col in data.columns for col in pca_features_2):
+    if all(col in data.columns for col in pca_features_2) and stats is not None:
+        _apply_fitted_pca(data, pca_features_2, stats['means_2'], stats['stds_2'],
+                          stats['components_2'], prefix='pc2')
+    elif all(col in data.columns for col in pca_features_2):
         # Standardisasi sederhana
         means_2 = [20, 6, 2000, 3000, 300, 300, 100]  # Estimasi mean
         stds_2 = [15, 4, 1500, 2000, 400, 250, 80]    # Estimasi std
@@ -105,7 +137,8 @@ def data_preprocessing(data):
         # Simulasi PCA dengan kombinasi linear sederhana
         data['pc2_1'] = 0.3 * data['Outstanding_Debt'] + 0.2 * data['Monthly_Balance']
         data['pc2_2'] = -0.1 * data['Changed_Credit_Limit'] + 0.05 * data['Total_EMI_per_month']
-        
+    
+    if all(col in data.columns for col in pca_features_2):
         # Drop kolom asli
         data = data.drop(columns=pca_features_2)
     
@@ -114,7 +147,7 @@ def data_preprocessing(data):
         data = data.drop(columns=['Credit_History_Age'])
     
     # 6. Reorder kolom sesuai dengan urutan yang diharapkan model
-    print("  5. Menyusun ulang kolom sesuai signature model...")
+    logger.debug("5. Menyusun ulang kolom sesuai signature model...")
     expected_columns = [
         "Age", "Credit_Mix", "Payment_of_Min_Amount", "Payment_Behaviour",
         "pc1_1", "pc1_2", "pc1_3", "pc1_4", "pc1_5",
@@ -129,79 +162,133 @@ def data_preprocessing(data):
     # Pilih hanya kolom yang dibutuhkan dengan urutan yang benar
     data = data[expected_columns]
     
-    print("✓ Preprocessing selesai!")
-    print(f"  Shape data hasil: {data.shape}")
-    print(f"  Kolom: {list(data.columns)}")
+    logger.debug("Preprocessing selesai! Shape data hasil: %s, kolom: %s", data.shape, list(data.columns))
     
     return data
 
 
-def prediction(data):
+def _apply_fitted_pca(data, features, means, stds, components, prefix):
+    """
+    Standardisasi lalu proyeksi ke komponen PCA yang sudah di-fit (in-place)
+    
+    Args:
+        data (Pandas DataFrame): DataFrame yang diproses
+        features (list): Kolom fitur grup
+        means (list): Mean per fitur
+        stds (list): Standar deviasi per fitur
+        components (list): Komponen PCA dengan shape (n_komponen, n_fitur)
+        prefix (str): Prefix nama kolom hasil, misalnya 'pc1'
+    """
+    stds = np.where(np.asarray(stds, dtype=float) == 0, 1.0, stds)
+    scaled = (data[features].to_numpy(dtype=float) - np.asarray(means)) / stds
+    projected = scaled @ np.asarray(components).T
+    for i in range(projected.shape[1]):
+        data[f'{prefix}_{i + 1}'] = projected[:, i]
+
+
+def decode_predictions(response_json):
+    """
+    Mengambil predictions dari response model server dan mengubahnya menjadi label
+    
+    Args:
+        response_json (dict/list): Body response /invocations yang sudah di-parse
+        
+    Returns:
+        list: Label prediksi (Good, Standard, atau Poor)
+    """
+    
+    # Ambil predictions
+    if isinstance(response_json, dict) and "predictions" in response_json:
+        predictions = response_json["predictions"]
+    else:
+        predictions = response_json
+    
+    logger.debug("Raw predictions: %s", predictions)
+    
+    # Konversi angka ke label
+    return [LABEL_MAPPING.get(pred, f"Unknown({pred})") for pred in predictions]
+
+
+@timed("prediction")
+def prediction(data, retries=0, url=DEFAULT_MODEL_URL, deadline=None, client=None):
     """
     Melakukan prediksi menggunakan API endpoint
     
     Args:
         data (str): Data dalam format JSON string
+        retries (int): Jumlah percobaan ulang jika gagal terhubung ke server
+        url (str): URL endpoint /invocations model yang dituju
+        deadline (float, optional): Batas waktu absolut (time.monotonic()) untuk
+            connect, send, dan read; lewat dari ini prediksi dianggap gagal
+        client (HedgedClient, optional): Client hedged ke beberapa replika, menggantikan url
         
     Returns:
         array: Hasil prediksi (Good, Standard, atau Poor)
     """
     
-    print("\n[PREDIKSI] Mengirim request ke API...")
+    logger.debug("[PREDIKSI] Mengirim request ke API...")
     
-    # URL endpoint dari model yang sedang di-serve
-    url = "http://127.0.0.1:5004/invocations"
     headers = {"Content-Type": "application/json"}
     
     try:
-        # Kirim POST request
-        response = requests.post(url, data=data, headers=headers)
+        # Kirim POST request, ulangi jika koneksi gagal
+        REGISTRY.inc("inference_request_bytes_total", len(data), stage="prediction")
+        for attempt in range(retries + 1):
+            try:
+                if client is not None:
+                    response = client.post(data, headers=headers, deadline=deadline)
+                elif deadline is not None:
+                    # connect, send, dan read dibatasi bersama oleh deadline yang sama
+                    response = post_with_deadline(url, data, headers, deadline)
+                else:
+                    response = requests.post(url, data=data, headers=headers)
+                break
+            except (requests.exceptions.ConnectionError, ConnectionError):
+                if attempt == retries or (deadline is not None and time.monotonic() >= deadline):
+                    raise
+                REGISTRY.inc("inference_retries_total", stage="prediction")
+                logger.warning("Koneksi gagal, mencoba ulang (%d/%d)...", attempt + 1, retries)
+        REGISTRY.inc("inference_response_bytes_total", len(response.content), stage="prediction")
         
         if response.status_code == 200:
-            print("✓ Request berhasil!")
-            
-            # Parse response
-            response_json = response.json()
-            
-            # Ambil predictions
-            if isinstance(response_json, dict) and "predictions" in response_json:
-                predictions = response_json["predictions"]
-            else:
-                predictions = response_json
+            logger.debug("Request berhasil!")
             
-            print(f"  Raw predictions: {predictions}")
+            # Parse response dan konversi angka ke label
+            final_result = decode_predictions(response.json())
             
-            # Decode hasil prediksi
-            # 0 = Good, 1 = Poor, 2 = Standard (sesuai dengan LabelEncoder)
-            label_mapping = {0: "Good", 1: "Poor", 2: "Standard"}
-            
-            # Konversi angka ke label
-            final_result = [label_mapping.get(pred, f"Unknown({pred})") for pred in predictions]
-            
-            print("✓ Prediksi selesai!")
+            REGISTRY.inc("inference_rows_total", len(final_result), stage="prediction")
+            logger.debug("Prediksi selesai!")
             
             return final_result
             
         else:
-            print(f"✗ Request gagal dengan status code: {response.status_code}")
-            print(f"  Response: {response.text}")
+            REGISTRY.inc("inference_errors_total", stage="prediction", reason="http_status")
+            logger.error("Request gagal dengan status code: %s, response: %s",
+                         response.status_code, response.text)
             return None
             
-    except requests.exceptions.ConnectionError:
-        print("✗ Gagal terhubung ke server!")
-        print("  Pastikan model server berjalan di http://127.0.0.1:5002")
-        print("\n  Jalankan command ini di terminal terpisah:")
-        print('  mlflow models serve -m "models:/credit-scoring/1" --port 5002 --no-conda')
+    except (DeadlineExceeded, TimeoutError, requests.exceptions.Timeout):
+        REGISTRY.inc("inference_errors_total", stage="prediction", reason="deadline")
+        logger.error("Prediksi melewati deadline")
+        return None
+        
+    except (requests.exceptions.ConnectionError, ConnectionError):
+        REGISTRY.inc("inference_errors_total", stage="prediction", reason="connection")
+        logger.error("Gagal terhubung ke server! Pastikan model server berjalan di http://127.0.0.1:5002")
+        logger.error('Jalankan command ini di terminal terpisah: '
+                     'mlflow models serve -m "models:/credit-scoring/1" --port 5002 --no-conda')
         return None
         
     except Exception as e:
-        print(f"✗ Error: {str(e)}")
+        REGISTRY.inc("inference_errors_total", stage="prediction", reason="exception")
+        logger.error("Error: %s", e)
         return None
 
 
-def prepare_payload(data_df):
+def dataframe_to_json(data_df):
     """
-    Mengubah DataFrame menjadi JSON payload untuk API
+    Serialisasi DataFrame ke format dataframe_split tanpa mencatat metrik
+    (dipakai juga untuk traffic non-primary, lihat shadow_scoring.py)
     
     Args:
         data_df (Pandas DataFrame): DataFrame yang sudah diproses
@@ -210,8 +297,6 @@ def prepare_payload(data_df):
         str: JSON string dalam format dataframe_split
     """
     
-    print("\n[PAYLOAD] Membuat JSON payload...")
-    
     # Konversi DataFrame ke format JSON yang diinginkan
     json_output = {
         "dataframe_split": {
@@ -221,61 +306,75 @@ def prepare_payload(data_df):
     }
     
     # Konversi ke JSON string
-    data_json = json.dumps(json_output)
+    return json.dumps(json_output)
+
+
+@timed("prepare_payload")
+def prepare_payload(data_df):
+    """
+    Mengubah DataFrame menjadi JSON payload untuk API
+    
+    Args:
+        data_df (Pandas DataFrame): DataFrame yang sudah diproses
+        
+    Returns:
+        str: JSON string dalam format dataframe_split
+    """
+    
+    logger.debug("[PAYLOAD] Membuat JSON payload...")
+    
+    data_json = dataframe_to_json(data_df)
     
-    print("✓ Payload berhasil dibuat!")
-    print(f"  Jumlah sample: {len(data_df)}")
-    print(f"  Jumlah fitur: {len(data_df.columns)}")
+    REGISTRY.inc("inference_rows_total", len(data_df), stage="prepare_payload")
+    REGISTRY.inc("inference_payload_bytes_total", len(data_json), stage="prepare_payload")
+    logger.debug("Payload berhasil dibuat! Jumlah sample: %d, jumlah fitur: %d",
+                 len(data_df), len(data_df.columns))
     
     return data_json
 
 
 # Fungsi utama untuk end-to-end inference
-def inference_pipeline(raw_data, columns):
+@timed("inference_pipeline")
+def inference_pipeline(raw_data, columns, timeout=None, client=None, stats=None):
     """
     Pipeline lengkap dari data mentah hingga prediksi
     
     Args:
         raw_data (list): Data mentah dari user dalam bentuk list
         columns (list): Nama-nama kolom yang sesuai dengan raw_data
+        timeout (float, optional): Deadline end-to-end dalam detik, termasuk preprocessing
+        client (HedgedClient, optional): Client hedged ke beberapa replika model server
+        stats (dict, optional): Statistik preprocessing hasil fit_preprocessing.py
         
     Returns:
         array: Hasil prediksi
     """
     
-    print("="*60)
-    print("INFERENCE PIPELINE - CREDIT SCORING")
-    print("="*60)
+    logger.debug("INFERENCE PIPELINE - CREDIT SCORING")
+    deadline = time.monotonic() + timeout if timeout is not None else None
     
     # 1. Konversi data ke DataFrame
-    print("\n[STEP 1] Konversi data ke DataFrame...")
+    logger.debug("[STEP 1] Konversi data ke DataFrame...")
     df = pd.DataFrame([raw_data], columns=columns)
-    print("✓ Data berhasil dikonversi")
-    print(f"  Shape: {df.shape}")
+    logger.debug("Data berhasil dikonversi, shape: %s", df.shape)
     
     # 2. Preprocessing
-    print("\n[STEP 2] Preprocessing data...")
-    processed_data = data_preprocessing(data=df)
+    logger.debug("[STEP 2] Preprocessing data...")
+    processed_data = data_preprocessing(data=df, stats=stats)
     
     # 3. Prepare payload
-    print("\n[STEP 3] Prepare JSON payload...")
+    logger.debug("[STEP 3] Prepare JSON payload...")
     payload = prepare_payload(processed_data)
     
     # 4. Prediksi
-    print("\n[STEP 4] Melakukan prediksi...")
-    result = prediction(payload)
-    
-    print("\n" + "="*60)
-    print("HASIL AKHIR")
-    print("="*60)
+    logger.debug("[STEP 4] Melakukan prediksi...")
+    result = prediction(payload, deadline=deadline, client=client)
     
     if result:
         for i, pred in enumerate(result):
-            print(f"  Sample {i+1}: {pred}")
+            logger.info("Sample %d: %s", i + 1, pred)
     else:
-        print("  Prediksi gagal!")
-    
-    print("="*60)
+        logger.warning("Prediksi gagal!")
     
     return result
 
@@ -283,6 +382,8 @@ def inference_pipeline(raw_data, columns):
 # Contoh penggunaan
 if __name__ == "__main__":
     
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+    
     # Definisi kolom (urutan harus sesuai dengan data)
     columns = [
         "Credit_Mix", "Payment_of_Min_Amount", "Payment_Behaviour", 
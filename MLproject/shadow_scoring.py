@@ -0,0 +1,219 @@
+"""
+Scoring shadow dan A/B untuk beberapa versi model dengan preprocessing bersama
+data_preprocessing dijalankan sekali per batch, payload yang sama dikirim ke model primary
+dan model shadow secara paralel; hanya label primary yang dikembalikan ke pemanggil,
+sedangkan tingkat ketidaksesuaian dan latency per model dicatat secara asinkron di metrics.py
+"""
+
+import time
+import zlib
+import logging
+import threading
+import requests
+import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from preprocessAPI import (
+    data_preprocessing, prepare_payload, prediction, decode_predictions, dataframe_to_json
+)
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+
+def _request_labels(payload, url, timeout):
+    """
+    Request ke model non-primary tanpa instrumentasi prediction(), supaya traffic shadow/varian
+    tidak tercampur ke metrik dan log error milik jalur primary
+
+    Args:
+        payload (str): JSON payload dari prepare_payload
+        url (str): URL endpoint /invocations
+        timeout (float): Batas waktu connect dan read (detik)
+
+    Returns:
+        list: Label prediksi
+
+    Raises:
+        requests.exceptions.RequestException: Jika request gagal atau status bukan 200
+    """
+    response = requests.post(url, data=payload, headers={"Content-Type": "application/json"},
+                             timeout=timeout)
+    response.raise_for_status()
+    return decode_predictions(response.json())
+
+
+class ShadowScorer:
+    """
+    Mengirim setiap batch ke model primary (sinkron) dan ke model shadow (background)
+
+    Contoh:
+        scorer = ShadowScorer(
+            primary_url="http://127.0.0.1:5004/invocations",
+            shadow_urls={"v2": "http://127.0.0.1:5005/invocations"},
+        )
+        labels = scorer.score(raw_df)
+    """
+
+    def __init__(self, primary_url, shadow_urls=None, max_workers=4, max_pending=64,
+                 shadow_timeout=2.0):
+        """
+        Args:
+            primary_url (str): URL model primary
+            shadow_urls (dict): Nama model shadow -> URL
+            shadow_timeout (float): Batas waktu request shadow (detik) agar replika yang
+                                    macet tidak menahan thread shadow selamanya
+            max_workers (int): Jumlah thread untuk request shadow
+            max_pending (int): Batas request shadow yang antre; lebih dari ini shadow dilewati
+                               supaya backlog tidak menumpuk saat model shadow lambat
+        """
+        self.primary_url = primary_url
+        self.shadow_urls = shadow_urls or {}
+        self.shadow_timeout = shadow_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="shadow")
+        self._pending = threading.BoundedSemaphore(max_pending)
+        # Hitungan per instance untuk disagreement_rates; REGISTRY bersifat global sehingga
+        # scorer lain (atau scorer sebelum rollout) dengan nama shadow yang sama ikut tercampur
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._disagreements = {}
+
+    def score(self, raw_data, stats=None):
+        """
+        Preprocessing sekali lalu scoring ke primary dan semua shadow
+
+        Args:
+            raw_data (Pandas DataFrame): Data mentah
+            stats (dict, optional): Statistik preprocessing hasil fit_preprocessing.py
+
+        Returns:
+            list: Label prediksi dari model primary (None jika gagal)
+        """
+        processed = data_preprocessing(raw_data, stats=stats)
+        payload = prepare_payload(processed)
+
+        # Shadow dikirim lebih dulu agar berjalan paralel dengan primary
+        primary_result = Future()
+        for name, url in self.shadow_urls.items():
+            if not self._pending.acquire(blocking=False):
+                REGISTRY.inc("shadow_dropped_total", model=name)
+                continue
+            future = self._executor.submit(self._run_shadow, name, url, payload, primary_result)
+            future.add_done_callback(lambda _: self._pending.release())
+
+        labels = None
+        try:
+            start = time.perf_counter()
+            labels = prediction(payload, url=self.primary_url)
+            REGISTRY.observe("shadow_latency_seconds", time.perf_counter() - start, model="primary")
+        finally:
+            # Hanya menyerahkan hasil; perbandingan dikerjakan thread shadow
+            primary_result.set_result(labels)
+        return labels
+
+    def _run_shadow(self, name, url, payload, primary_result):
+        """Request ke model shadow lalu bandingkan dengan hasil primary (di thread background)"""
+        start = time.perf_counter()
+        try:
+            shadow_labels = _request_labels(payload, url, self.shadow_timeout)
+        except Exception as e:
+            REGISTRY.inc("shadow_errors_total", model=name)
+            logger.debug("Request shadow %s gagal: %s", name, e)
+            return
+        REGISTRY.observe("shadow_latency_seconds", time.perf_counter() - start, model=name)
+
+        primary_labels = primary_result.result()
+        if primary_labels is None:
+            # Primary gagal, tidak ada pembanding
+            return
+
+        disagreements = int(np.sum(np.asarray(primary_labels) != np.asarray(shadow_labels)))
+        REGISTRY.inc("shadow_rows_total", len(primary_labels), model=name)
+        REGISTRY.inc("shadow_disagreements_total", disagreements, model=name)
+        with self._lock:
+            self._rows[name] = self._rows.get(name, 0) + len(primary_labels)
+            self._disagreements[name] = self._disagreements.get(name, 0) + disagreements
+        if disagreements:
+            logger.debug("Shadow %s berbeda pada %d dari %d baris",
+                         name, disagreements, len(primary_labels))
+
+    def disagreement_rates(self):
+        """
+        Menghitung tingkat ketidaksesuaian setiap shadow terhadap primary untuk scorer ini
+
+        Returns:
+            dict: Nama model shadow -> rasio baris yang berbeda
+        """
+        with self._lock:
+            return {
+                name: self._disagreements.get(name, 0) / total
+                for name, total in self._rows.items() if total
+            }
+
+    def close(self, wait=True):
+        """Menghentikan thread shadow (tunggu request yang masih berjalan jika wait=True)"""
+        self._executor.shutdown(wait=wait)
+
+
+def assign_variant(customer_keys, weights):
+    """
+    Menentukan varian A/B per customer secara deterministik dari hash customer key
+
+    Args:
+        customer_keys (iterable): ID customer per baris
+        weights (dict): Nama varian -> bobot traffic (tidak harus berjumlah 1)
+
+    Returns:
+        numpy.ndarray: Nama varian per baris
+    """
+    names = list(weights)
+    bounds = np.cumsum([weights[name] for name in names], dtype=np.float64)
+    bounds /= bounds[-1]
+
+    # crc32 stabil antar proses (berbeda dengan hash() bawaan Python)
+    buckets = np.array(
+        [zlib.crc32(str(key).encode("utf-8")) / 2**32 for key in customer_keys]
+    )
+    index = np.minimum(np.searchsorted(bounds, buckets, side="right"), len(names) - 1)
+    return np.array(names, dtype=object)[index]
+
+
+def split_score(raw_data, customer_keys, variants, stats=None, max_workers=4, timeout=10.0):
+    """
+    Scoring A/B: preprocessing sekali, lalu tiap baris dikirim ke model varian miliknya
+
+    Args:
+        raw_data (Pandas DataFrame): Data mentah
+        customer_keys (iterable): ID customer per baris (dasar pembagian traffic)
+        variants (dict): Nama varian -> (URL model, bobot traffic)
+        stats (dict, optional): Statistik preprocessing hasil fit_preprocessing.py
+        max_workers (int): Jumlah request varian yang dikirim paralel
+        timeout (float): Batas waktu request per varian (detik)
+
+    Returns:
+        tuple: (list label per baris sesuai urutan input, numpy.ndarray varian per baris)
+    """
+    assignment = assign_variant(customer_keys, {name: w for name, (_, w) in variants.items()})
+    processed = data_preprocessing(raw_data, stats=stats)
+
+    def score_variant(name):
+        mask = assignment == name
+        start = time.perf_counter()
+        try:
+            labels = _request_labels(dataframe_to_json(processed[mask]), variants[name][0], timeout)
+        except Exception as e:
+            REGISTRY.inc("variant_errors_total", model=name)
+            logger.warning("Request varian %s gagal: %s", name, e)
+            labels = None
+        REGISTRY.observe("variant_latency_seconds", time.perf_counter() - start, model=name)
+        REGISTRY.inc("variant_rows_total", int(mask.sum()), model=name)
+        return mask, labels
+
+    results = [None] * len(processed)
+    used = [name for name in variants if (assignment == name).any()]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for mask, labels in executor.map(score_variant, used):
+            for position, label in zip(np.flatnonzero(mask), labels or [None] * int(mask.sum())):
+                results[position] = label
+
+    return results, assignment
@@ -0,0 +1,76 @@
+"""
+Helper untuk berbagi array NumPy antar proses lewat shared memory
+Dipakai oleh script yang menjalankan process pool (tuning, batch scoring, evaluasi)
+supaya data tidak perlu di-pickle ulang ke setiap worker
+"""
+
+import numpy as np
+from multiprocessing import shared_memory
+
+
+def share_array(array):
+    """
+    Menyalin array ke blok shared memory baru
+
+    Args:
+        array (numpy.ndarray): Array yang akan dibagikan
+
+    Returns:
+        tuple: (SharedMemory, spec) - spec berisi (nama, shape, dtype) untuk di-attach worker
+    """
+    array = np.ascontiguousarray(array)
+    # SharedMemory tidak boleh berukuran 0 byte
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    view[...] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+
+def empty_shared_array(shape, dtype):
+    """
+    Membuat array kosong (berisi nol) di shared memory, misalnya untuk output worker
+
+    Args:
+        shape (tuple): Bentuk array
+        dtype: Tipe data array
+
+    Returns:
+        tuple: (SharedMemory, spec, numpy.ndarray view)
+    """
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+    view = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    view.fill(0)
+    return shm, (shm.name, tuple(shape), dtype.str), view
+
+
+def attach_array(spec):
+    """
+    Membuka array yang sudah dibagikan oleh proses lain (tanpa menyalin data)
+
+    Args:
+        spec (tuple): Spec dari share_array / empty_shared_array
+
+    Returns:
+        tuple: (SharedMemory, numpy.ndarray view) - simpan handle SharedMemory
+               selama view masih dipakai
+    """
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def release(*blocks):
+    """
+    Menutup dan menghapus blok shared memory milik proses pembuat
+
+    Args:
+        *blocks (SharedMemory): Blok yang dibuat dengan share_array / empty_shared_array
+    """
+    for shm in blocks:
+        try:
+            shm.close()
+            shm.unlink()
+        except FileNotFoundError:
+            pass
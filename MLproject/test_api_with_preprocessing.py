@@ -3,8 +3,13 @@ Testing API dengan Data Mentah + Preprocessing
 Script untuk menguji endpoint API model dengan data mentah yang belum diproses
 """
 
+import logging
 import pandas as pd
 from preprocessAPI import inference_pipeline
+from metrics import render_prometheus
+
+# Tampilkan log tiap tahap pipeline saat testing
+logging.basicConfig(level=logging.DEBUG, format="%(message)s")
 
 print("="*70)
 print("TESTING API DENGAN DATA MENTAH")
@@ -172,6 +177,10 @@ print("\n" + "="*70)
 print("✓ Testing selesai!")
 print("="*70)
 
+print("\n📈 METRIK INFERENCE (format Prometheus):")
+print("-"*70)
+print(render_prometheus())
+
 print("\n💡 CATATAN:")
 print("-"*70)
 print("• Model menerima data MENTAH (belum diproses)")
@@ -0,0 +1,350 @@
+"""
+Script pencarian hyperparameter RandomForest yang memperhitungkan latency dan ukuran model
+Trial dijalankan paralel di process pool (data training di shared memory),
+trial yang lemah dipangkas lebih awal dengan successive halving (akurasi vs ukuran model),
+dan hasil akhirnya berupa Pareto front (akurasi vs latency vs ukuran artefak)
+"""
+
+import sys
+import time
+import pickle
+import random
+import itertools
+import numpy as np
+import pandas as pd
+import mlflow
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+
+from shared_array import share_array, attach_array, release
+from latency import measure_latency
+
+# Ruang pencarian hyperparameter
+SEARCH_SPACE = {
+    "n_estimators": [25, 50, 100, 200, 300, 505],
+    "max_depth": [8, 12, 16, 20, 25, 30, 37],
+    "min_samples_leaf": [1, 2, 4, 8],
+    "max_features": ["sqrt", "log2", 0.5],
+}
+
+# Array training/testing yang di-attach oleh setiap worker
+_worker_data = {}
+
+
+def _init_worker(specs):
+    """
+    Initializer worker: attach ke array di shared memory sekali per proses
+
+    Args:
+        specs (dict): Nama array -> spec dari share_array
+    """
+    for key, spec in specs.items():
+        _worker_data[key] = attach_array(spec)
+
+
+def sample_configs(n_trials, seed=42):
+    """
+    Mengambil kombinasi hyperparameter unik secara acak dari SEARCH_SPACE (tanpa pengembalian)
+
+    Args:
+        n_trials (int): Jumlah trial, dibatasi jumlah kombinasi yang ada
+        seed (int): Seed agar pencarian bisa diulang
+
+    Returns:
+        list: List dict hyperparameter
+    """
+    rng = random.Random(seed)
+    combinations = list(itertools.product(*SEARCH_SPACE.values()))
+    return [
+        dict(zip(SEARCH_SPACE, values))
+        for values in rng.sample(combinations, min(n_trials, len(combinations)))
+    ]
+
+
+def run_trial(trial_id, params, n_rows, return_model=False):
+    """
+    Melatih satu trial pada sebagian data training (budget successive halving)
+
+    Args:
+        trial_id (int): ID trial
+        params (dict): Hyperparameter RandomForest
+        n_rows (int): Jumlah baris training yang dipakai pada rung ini
+        return_model (bool): Sertakan model ter-pickle agar latency bisa diukur terpisah
+
+    Returns:
+        dict: Hasil trial (params, budget, akurasi, ukuran model, dan model_bytes jika diminta)
+    """
+    X_train = _worker_data["X_train"][1]
+    y_train = _worker_data["y_train"][1]
+    X_test = _worker_data["X_test"][1]
+    y_test = _worker_data["y_test"][1]
+
+    model = RandomForestClassifier(random_state=42, n_jobs=1, **params)
+
+    start = time.perf_counter()
+    model.fit(X_train[:n_rows], y_train[:n_rows])
+    fit_seconds = time.perf_counter() - start
+
+    # Ukuran pickle murah dihitung dan tidak terpengaruh trial lain, jadi dipakai di setiap rung
+    model_bytes = pickle.dumps(model)
+    result = {
+        "trial_id": trial_id,
+        **params,
+        "n_rows": n_rows,
+        "accuracy": float(np.mean(model.predict(X_test) == y_test)),
+        "fit_seconds": fit_seconds,
+        "model_size_mb": len(model_bytes) / (1024 * 1024),
+    }
+    if return_model:
+        result["model_bytes"] = model_bytes
+
+    return result
+
+
+def measure_trial(model_bytes):
+    """
+    Mengukur latency model hasil run_trial terhadap data test di shared memory
+
+    Args:
+        model_bytes (bytes): Model ter-pickle dari run_trial(..., return_model=True)
+
+    Returns:
+        dict: Metrik latency dari measure_latency
+    """
+    return measure_latency(pickle.loads(model_bytes), _worker_data["X_test"][1])
+
+
+def non_dominated_ranks(results, accuracy_target):
+    """
+    Non-dominated sorting pada akurasi (lebih tinggi lebih baik) dan ukuran model (lebih kecil
+    lebih baik). Akurasi di atas target dianggap setara, sehingga forest kecil yang sudah
+    memenuhi target tidak kalah oleh forest besar yang hanya sedikit lebih akurat
+
+    Args:
+        results (list): Hasil trial dari satu rung
+        accuracy_target (float): Akurasi minimum yang disyaratkan
+
+    Returns:
+        list: Nomor front per trial (0 = tidak didominasi), urutannya sama dengan results
+    """
+    points = [(min(r["accuracy"], accuracy_target), r["model_size_mb"]) for r in results]
+
+    def dominates(a, b):
+        return a[0] >= b[0] and a[1] <= b[1] and (a[0] > b[0] or a[1] < b[1])
+
+    ranks = [None] * len(points)
+    remaining = set(range(len(points)))
+    front = 0
+    while remaining:
+        current = {
+            i for i in remaining
+            if not any(dominates(points[j], points[i]) for j in remaining if j != i)
+        }
+        for i in current:
+            ranks[i] = front
+        remaining -= current
+        front += 1
+    return ranks
+
+
+def successive_halving(executor, configs, n_train, accuracy_target, eta=3, min_rows=2000):
+    """
+    Menjalankan successive halving: semua trial mulai dengan budget data kecil,
+    hanya 1/eta trial yang lanjut ke rung berikutnya dengan data eta kali lebih banyak.
+    Trial yang lanjut dipilih per front non-dominated (akurasi vs ukuran model),
+    bukan hanya akurasi, agar forest kecil yang memenuhi target tidak terpangkas
+
+    Args:
+        executor (ProcessPoolExecutor): Pool worker
+        configs (list): List dict hyperparameter
+        n_train (int): Jumlah baris training penuh
+        accuracy_target (float): Akurasi minimum yang disyaratkan
+        eta (int): Faktor pemangkasan
+        min_rows (int): Budget baris minimum pada rung pertama
+
+    Returns:
+        tuple: (hasil rung terakhir, riwayat semua rung)
+    """
+    # Hitung jumlah rung: rung terakhir memakai seluruh data training dan
+    # masih menyisakan minimal eta trial agar Pareto front punya pilihan
+    n_rungs = 1
+    while n_train / (eta ** n_rungs) >= min_rows and len(configs) / (eta ** n_rungs) >= eta:
+        n_rungs += 1
+
+    survivors = list(enumerate(configs))
+    history = []
+
+    for rung in range(n_rungs):
+        is_last = rung == n_rungs - 1
+        n_rows = n_train if is_last else int(n_train / eta ** (n_rungs - 1 - rung))
+
+        print(f"\n[RUNG {rung + 1}/{n_rungs}] {len(survivors)} trial, {n_rows} baris training")
+        futures = [
+            executor.submit(run_trial, trial_id, params, n_rows, is_last)
+            for trial_id, params in survivors
+        ]
+        results = [future.result() for future in futures]
+
+        if is_last:
+            # Fit tetap paralel, tetapi latency diukur satu per satu setelah semua fit selesai
+            # agar pengukuran tidak terganggu trial lain yang sedang berjalan
+            for result in results:
+                result.update(executor.submit(measure_trial, result.pop("model_bytes")).result())
+
+        for result in results:
+            result["rung"] = rung
+        history.extend(results)
+
+        if is_last:
+            return results, history
+
+        # Pangkas trial: ambil front terbaik lebih dulu, di dalam front utamakan akurasi
+        ranks = non_dominated_ranks(results, accuracy_target)
+        order = sorted(range(len(results)), key=lambda i: (ranks[i], -results[i]["accuracy"]))
+        n_keep = max(1, len(results) // eta)
+        keep = {results[i]["trial_id"] for i in order[:n_keep]}
+        survivors = [(trial_id, params) for trial_id, params in survivors if trial_id in keep]
+
+    return [], history
+
+
+def pareto_front(results):
+    """
+    Mengambil trial yang tidak didominasi trial lain
+    (akurasi lebih tinggi lebih baik; latency dan ukuran lebih kecil lebih baik)
+
+    Args:
+        results (list): Hasil trial dari rung terakhir
+
+    Returns:
+        list: Trial yang berada di Pareto front
+    """
+    def dominates(a, b):
+        no_worse = (
+            a["accuracy"] >= b["accuracy"]
+            and a["latency_single_ms"] <= b["latency_single_ms"]
+            and a["model_size_mb"] <= b["model_size_mb"]
+        )
+        better = (
+            a["accuracy"] > b["accuracy"]
+            or a["latency_single_ms"] < b["latency_single_ms"]
+            or a["model_size_mb"] < b["model_size_mb"]
+        )
+        return no_worse and better
+
+    return [r for r in results if not any(dominates(other, r) for other in results)]
+
+
+def select_model(front, accuracy_target):
+    """
+    Memilih model terkecil dan tercepat di Pareto front yang memenuhi target akurasi
+
+    Args:
+        front (list): Trial di Pareto front
+        accuracy_target (float): Akurasi minimum yang disyaratkan
+
+    Returns:
+        dict: Trial terpilih, atau None jika tidak ada yang memenuhi target
+    """
+    eligible = [r for r in front if r["accuracy"] >= accuracy_target]
+    if not eligible:
+        return None
+    return min(eligible, key=lambda r: (r["model_size_mb"], r["latency_single_ms"]))
+
+
+def main(n_trials=27, accuracy_target=0.75, n_workers=4, dataset="train_pca.csv"):
+    mlflow.set_tracking_uri("http://127.0.0.1:5000/")
+    mlflow.set_experiment("Latihan Credit Scoring")
+
+    data = pd.read_csv(dataset)
+    X_train, X_test, y_train, y_test = train_test_split(
+        data.drop("Credit_Score", axis=1),
+        data["Credit_Score"],
+        random_state=42,
+        test_size=0.2
+    )
+
+    configs = sample_configs(n_trials)
+    if not configs:
+        print("✗ n_trials harus minimal 1")
+        sys.exit(1)
+
+    # Letakkan data di shared memory supaya worker tidak menerima salinan pickle
+    blocks, specs = [], {}
+    for key, array in {
+        "X_train": X_train.to_numpy(dtype=np.float64),
+        "y_train": y_train.to_numpy(),
+        "X_test": X_test.to_numpy(dtype=np.float64),
+        "y_test": y_test.to_numpy(),
+    }.items():
+        shm, specs[key] = share_array(array)
+        blocks.append(shm)
+
+    try:
+        with mlflow.start_run(run_name="latency-aware-search"):
+            mlflow.log_params({
+                "n_trials": n_trials,
+                "accuracy_target": accuracy_target,
+                "n_workers": n_workers,
+                "dataset": dataset,
+            })
+
+            with ProcessPoolExecutor(
+                max_workers=n_workers, initializer=_init_worker, initargs=(specs,)
+            ) as executor:
+                final_results, history = successive_halving(
+                    executor, configs, len(X_train), accuracy_target
+                )
+
+            # Log setiap trial sebagai nested run, termasuk yang terpangkas;
+            # metrik tiap rung di-log dengan step = nomor rung
+            final_ids = {result["trial_id"] for result in final_results}
+            for trial_id, params in enumerate(configs):
+                rungs = [r for r in history if r["trial_id"] == trial_id]
+                with mlflow.start_run(run_name=f"trial-{trial_id}", nested=True):
+                    mlflow.log_params(params)
+                    mlflow.set_tag("status", "final" if trial_id in final_ids else "pruned")
+                    mlflow.set_tag("last_rung", rungs[-1]["rung"])
+                    for result in rungs:
+                        mlflow.log_metrics({
+                            key: result[key] for key in (
+                                "accuracy", "latency_single_ms", "latency_batch_ms",
+                                "throughput_rows_per_s", "model_size_mb", "fit_seconds", "n_rows",
+                            ) if key in result
+                        }, step=result["rung"])
+
+            front = pareto_front(final_results)
+            front.sort(key=lambda r: r["accuracy"], reverse=True)
+            mlflow.log_table(pd.DataFrame(history), artifact_file="search_history.json")
+            mlflow.log_table(pd.DataFrame(front), artifact_file="pareto_front.json")
+
+            print("\n" + "=" * 60)
+            print("PARETO FRONT")
+            print("=" * 60)
+            print(pd.DataFrame(front)[
+                ["trial_id", *SEARCH_SPACE, "accuracy", "latency_single_ms", "model_size_mb"]
+            ].to_string(index=False))
+
+            best = select_model(front, accuracy_target)
+            if best is None:
+                print(f"\n✗ Tidak ada trial dengan akurasi >= {accuracy_target}")
+            else:
+                print(f"\n✓ Model terpilih: trial {best['trial_id']}")
+                mlflow.log_params({f"best_{name}": best[name] for name in SEARCH_SPACE})
+                mlflow.log_metrics({
+                    "best_accuracy": best["accuracy"],
+                    "best_latency_single_ms": best["latency_single_ms"],
+                    "best_model_size_mb": best["model_size_mb"],
+                })
+    finally:
+        release(*blocks)
+
+
+if __name__ == "__main__":
+    main(
+        n_trials=int(sys.argv[1]) if len(sys.argv) > 1 else 27,
+        accuracy_target=float(sys.argv[2]) if len(sys.argv) > 2 else 0.75,
+        n_workers=int(sys.argv[3]) if len(sys.argv) > 3 else 4,
+        dataset=sys.argv[4] if len(sys.argv) > 4 else "train_pca.csv",
+    )